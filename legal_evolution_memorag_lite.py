@@ -13,14 +13,87 @@ Date: September 2024
 
 import os
 import sys
+import copy
 import json
+import pickle
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 from pathlib import Path
 import re
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except ImportError:
+    _HAS_AHOCORASICK = False
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Common Spanish words excluded from keyword extraction and indexing
+_STOPWORDS = frozenset({'de', 'la', 'el', 'en', 'y', 'a', 'que', 'del', 'las', 'los', 'con', 'por', 'para'})
+_MIN_KEYWORD_LEN = 4
+
+# Precompiled patterns for keyword, year and legal source extraction
+_WORD_RE = re.compile(r'\w+')
+_KEYWORD_RE = re.compile(rf'\w{{{_MIN_KEYWORD_LEN},}}')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+# Common Argentine legal source patterns, merged into one alternation so a single scan finds them all
+_SOURCE_RE = re.compile(
+    r'Ley \d+\.\d+|Decreto \d+/\d+|Fallos \d+:\d+|InfoLeg|SAIJ|CSJN|BCRA|CNV',
+    re.IGNORECASE
+)
+
+# Fields indexed for keyword search: every field rendered by _build_case_memory / _build_crisis_memory
+_CASE_TEXT_COLUMNS = [
+    'nombre_caso', 'area_derecho', 'fecha_inicio', 'fecha_fin', 'tipo_seleccion', 'origen', 'exito',
+    'presion_ambiental', 'actores_principales', 'normativa_primaria', 'fallos_relevantes',
+    'supervivencia_anos', 'mutaciones_identificadas', 'difusion_otras_jurisdicciones', 'notas'
+]
+_CRISIS_TEXT_COLUMNS = [
+    'crisis_name', 'start_date', 'end_date', 'crisis_type', 'severity_level', 'legal_changes_count',
+    'emergency_decrees', 'new_laws', 'acceleration_factor', 'economic_indicators',
+    'recovery_timeline_months', 'long_term_institutional_impact'
+]
+
+# Terms detected in generated responses, besides the configured legal domains
+_EVOLUTION_MECHANISMS = ['acumulativa', 'artificial', 'mixta', 'transplante', 'endogeno', 'hibrido']
+_SUCCESS_TERMS = ['exitoso', 'parcial', 'fracaso', 'en_desarrollo']
+
+# Date columns are kept as ISO strings (Arrow would otherwise infer date32)
+_DATE_COLUMNS = [
+    'fecha_inicio', 'fecha_fin', 'start_date', 'end_date',
+    'introduction_date', 'modification_date', 'origin_date'
+]
+
+# Same missing-value markers as pandas.read_csv
+_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+def _value_or_none(value: Any) -> Any:
+    """Map missing values (NaN, or pd.NA from nullable Arrow columns) to None"""
+    return None if pd.isna(value) else value
+
+def _dumps_report(report: Dict) -> bytes:
+    """Serialize a report as indented UTF-8 JSON, using orjson when available"""
+    if _HAS_ORJSON:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')
 
 class LegalEvolutionMemoRAGLite:
     """
@@ -33,6 +106,7 @@ class LegalEvolutionMemoRAGLite:
     def __init__(self, config_path: Optional[str] = None):
         """Initialize Legal Evolution MemoRAG Lite system"""
         self.config = self._load_config(config_path)
+        self._build_term_matcher()
         self.legal_memory = {}
         self.evolution_cases = pd.DataFrame()
         self.velocity_metrics = pd.DataFrame()
@@ -49,6 +123,9 @@ class LegalEvolutionMemoRAGLite:
             'innovations_exported': './innovations_exported.csv'
         }
         
+        # Persisted memory index for warm starts (None disables persistence)
+        self.index_cache_path = self._resolve_index_cache_path()
+        
         self._load_legal_datasets()
         self._build_memory_index()
         
@@ -65,6 +142,8 @@ class LegalEvolutionMemoRAGLite:
             "memory_type": "legal_evolution",
             "max_memory_length": 10000,
             "retrieval_top_k": 20,
+            "query_cache_size": 1000,
+            "index_cache_path": "memorag_index.pkl",
             "legal_domains": [
                 "constitucional", "civil", "comercial", "financiero", 
                 "administrativo", "procesal", "criminal", "laboral",
@@ -93,12 +172,28 @@ class LegalEvolutionMemoRAGLite:
         
         return default_config
     
+    def _build_term_matcher(self):
+        """Build the multi-pattern matcher for the terms reported by _analyze_response"""
+        self._analysis_terms = (
+            [(area, 'legal_areas_mentioned') for area in self.config['legal_domains']] +
+            [(mechanism, 'evolution_mechanisms') for mechanism in _EVOLUTION_MECHANISMS] +
+            [(term, 'success_indicators') for term in _SUCCESS_TERMS]
+        )
+        
+        # Aho-Corasick automaton: one pass over the response finds every term
+        self._term_automaton = None
+        if _HAS_AHOCORASICK:
+            self._term_automaton = ahocorasick.Automaton()
+            for term, _ in self._analysis_terms:
+                self._term_automaton.add_word(term, term)
+            self._term_automaton.make_automaton()
+    
     def _load_legal_datasets(self):
         """Load all Legal Evolution Dataset files into memory"""
         try:
             for dataset_name, path in self.dataset_paths.items():
                 if os.path.exists(path):
-                    df = pd.read_csv(path, encoding='utf-8')
+                    df = self._read_dataset(path)
                     setattr(self, dataset_name, df)
                     print(f"✅ Loaded {dataset_name}: {len(df)} records")
                 else:
@@ -109,12 +204,34 @@ class LegalEvolutionMemoRAGLite:
             print(f"❌ Error loading legal datasets: {e}")
             raise
     
+    def _read_dataset(self, path: str) -> pd.DataFrame:
+        """Read a dataset CSV, using the PyArrow parser and Arrow-backed columns when available"""
+        if not _HAS_PYARROW:
+            return pd.read_csv(path, encoding='utf-8')
+        
+        convert_options = pv.ConvertOptions(
+            column_types={column: pa.string() for column in _DATE_COLUMNS},
+            null_values=_NULL_VALUES,
+            strings_can_be_null=True
+        )
+        table = pv.read_csv(path, convert_options=convert_options)
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    
     def _build_memory_index(self):
         """Build searchable memory index from legal datasets"""
+        # Cached query results are only valid for the index they were computed on
+        self._query_cache = OrderedDict()
+        
+        if self._load_cached_index():
+            print(f"🧠 Memory index loaded from cache: {len(self.memory_index['evolution_cases'])} cases, {len(self.memory_index['crisis_periods'])} crises")
+            return
+        
         self.memory_index = {
             'evolution_cases': {},
             'crisis_periods': {},
             'transplant_cases': {},
+            'records': [],
+            'ordinal_ranges': {},
             'keywords': defaultdict(list),
             'temporal': defaultdict(list),
             'legal_areas': defaultdict(list)
@@ -122,46 +239,146 @@ class LegalEvolutionMemoRAGLite:
         
         # Index evolution cases
         if not self.evolution_cases.empty:
-            for idx, case in self.evolution_cases.iterrows():
-                case_id = case['case_id']
+            df = self.evolution_cases
+            # Interned ids: every index structure shares one string object per id
+            case_ids = pd.Series([sys.intern(str(case_id)) for case_id in df['case_id']], index=df.index, dtype=object)
+            cols = ['area_derecho', 'fecha_inicio', 'exito']
+            for case_id, case in zip(case_ids, df[cols].itertuples(name='Case')):
                 self.memory_index['evolution_cases'][case_id] = {
-                    'content': self._build_case_memory(case),
+                    'row_idx': case.Index,
                     'metadata': {
-                        'legal_area': case['area_derecho'],
-                        'start_date': case['fecha_inicio'],
-                        'success': case['exito'],
+                        'legal_area': _value_or_none(case.area_derecho),
+                        'start_date': _value_or_none(case.fecha_inicio),
+                        'success': _value_or_none(case.exito),
                         'type': 'evolution_case'
                     }
                 }
-                
-                # Build keyword index
-                keywords = self._extract_keywords(case['nombre_caso'] + " " + str(case.get('notas', '')))
-                for keyword in keywords:
-                    self.memory_index['keywords'][keyword.lower()].append(case_id)
-                
-                # Build temporal index
-                year = str(case['fecha_inicio'])[:4]
-                self.memory_index['temporal'][year].append(case_id)
-                
-                # Build legal area index
-                self.memory_index['legal_areas'][case['area_derecho']].append(case_id)
+            
+            # Build keyword index
+            self._index_keywords(df, 'evolution_cases', case_ids, _CASE_TEXT_COLUMNS)
+            
+            # Build temporal index
+            years = df['fecha_inicio'].astype(str).str[:4]
+            self.memory_index['temporal'].update(case_ids.groupby(years, sort=False).agg(list).to_dict())
+            
+            # Build legal area index
+            self.memory_index['legal_areas'].update(
+                case_ids.groupby(df['area_derecho'], sort=False, dropna=False).agg(list).to_dict()
+            )
         
         # Index crisis periods
         if not self.crisis_periods.empty:
-            for idx, crisis in self.crisis_periods.iterrows():
-                crisis_id = crisis['crisis_id']
+            crisis_ids = pd.Series(
+                [sys.intern(str(crisis_id)) for crisis_id in self.crisis_periods['crisis_id']],
+                index=self.crisis_periods.index, dtype=object
+            )
+            cols = ['crisis_type', 'severity_level', 'start_date']
+            for crisis_id, crisis in zip(crisis_ids, self.crisis_periods[cols].itertuples(name='Crisis')):
                 self.memory_index['crisis_periods'][crisis_id] = {
-                    'content': self._build_crisis_memory(crisis),
+                    'row_idx': crisis.Index,
                     'metadata': {
-                        'crisis_type': crisis['crisis_type'],
-                        'severity': crisis['severity_level'],
-                        'start_date': crisis['start_date'],
+                        'crisis_type': _value_or_none(crisis.crisis_type),
+                        'severity': _value_or_none(crisis.severity_level),
+                        'start_date': _value_or_none(crisis.start_date),
                         'type': 'crisis_period'
                     }
                 }
+            
+            self._index_keywords(self.crisis_periods, 'crisis_periods', crisis_ids, _CRISIS_TEXT_COLUMNS)
         
+        # Freeze keyword postings into sorted int32 ordinal arrays
+        self.memory_index['keywords'] = {
+            keyword: np.unique(np.asarray(ordinals, dtype=np.int32))
+            for keyword, ordinals in self.memory_index['keywords'].items()
+        }
+        
+        self._save_cached_index()
         print(f"🧠 Memory index built: {len(self.memory_index['evolution_cases'])} cases, {len(self.memory_index['crisis_periods'])} crises")
     
+    def _resolve_index_cache_path(self) -> Optional[str]:
+        """Index cache path from the config; relative paths are resolved next to the datasets"""
+        cache_path = self.config.get('index_cache_path')
+        if not cache_path:
+            return None
+        
+        dataset_dir = os.path.dirname(self.dataset_paths['evolution_cases'])
+        return os.path.join(dataset_dir, cache_path)
+    
+    def _index_sources_signature(self) -> Dict[str, Optional[List[int]]]:
+        """[mtime, size] of every dataset path and this module; None for missing files"""
+        signature = {}
+        for path in list(self.dataset_paths.values()) + [__file__]:
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature[path] = [stat.st_mtime_ns, stat.st_size]
+            else:
+                signature[path] = None
+        return signature
+    
+    def _load_cached_index(self) -> bool:
+        """Load the persisted memory index if it was built from exactly the current sources"""
+        cache_path = self.index_cache_path
+        if not cache_path or not os.path.exists(cache_path):
+            return False
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                # The JSON header line is checked before anything is unpickled:
+                # any added, removed or modified dataset (or module change) invalidates the cache
+                header = json.loads(f.readline())
+                if not isinstance(header, dict) or header.get('sources') != self._index_sources_signature():
+                    return False
+                self.memory_index = pickle.load(f)
+            return True
+        except Exception as e:
+            print(f"⚠️ Index cache loading error: {e}, rebuilding index")
+            return False
+    
+    def _save_cached_index(self):
+        """Persist the memory index, after a header with the signature of its sources"""
+        if not self.index_cache_path:
+            return
+        
+        header = json.dumps({'sources': self._index_sources_signature()}).encode('utf-8')
+        try:
+            with open(self.index_cache_path, 'wb') as f:
+                f.write(header + b'\n')
+                pickle.dump(self.memory_index, f, protocol=5)
+        except Exception as e:
+            print(f"⚠️ Index cache saving error: {e}")
+    
+    def _index_keywords(self, df: pd.DataFrame, collection: str, record_ids: pd.Series, text_columns: List[str]):
+        """Add keyword postings (keyword -> record ordinals) for the given text columns"""
+        # Records are numbered consecutively across collections
+        records = self.memory_index['records']
+        start = len(records)
+        records.extend((collection, record_id) for record_id in record_ids)
+        self.memory_index['ordinal_ranges'][collection] = (start, len(records))
+        ordinals = pd.Series(np.arange(start, len(records), dtype=np.int32), index=df.index)
+        
+        text = pd.Series('', index=df.index)
+        for column in text_columns:
+            if column in df.columns:
+                text = text + ' ' + df[column].astype('string').fillna('')
+        
+        # One (row, keyword) pair per match, deduplicated per record
+        keywords = text.str.lower().str.findall(_KEYWORD_RE).explode().dropna()
+        keywords = keywords[~keywords.isin(_STOPWORDS)]
+        postings = pd.DataFrame({'keyword': keywords, 'ordinal': ordinals.reindex(keywords.index)})
+        postings = postings.drop_duplicates().groupby('keyword', sort=False)['ordinal'].agg(list)
+        
+        for keyword, record_ordinals in postings.items():
+            self.memory_index['keywords'][keyword].extend(record_ordinals)
+    
+    def _content_for(self, record_id: str, record_type: str) -> str:
+        """Build memory content for an indexed record on demand"""
+        if record_type == 'crisis_period':
+            row_idx = self.memory_index['crisis_periods'][record_id]['row_idx']
+            return self._build_crisis_memory(self.crisis_periods.loc[row_idx])
+        
+        row_idx = self.memory_index['evolution_cases'][record_id]['row_idx']
+        return self._build_case_memory(self.evolution_cases.loc[row_idx])
+    
     def _build_case_memory(self, case: pd.Series) -> str:
         """Build memory content for legal evolution case"""
         return f"""
@@ -197,17 +414,15 @@ class LegalEvolutionMemoRAGLite:
         Long-term Impact: {crisis['long_term_institutional_impact']}
         """
     
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text"""
+    def _extract_keywords(self, text: str) -> Set[str]:
+        """Extract the set of distinct keywords from text"""
         if pd.isna(text):
-            return []
+            return set()
         
         # Simple keyword extraction
-        words = re.findall(r'\w+', text.lower())
+        words = _WORD_RE.findall(text.lower())
         # Filter out common words and keep meaningful terms
-        stopwords = {'de', 'la', 'el', 'en', 'y', 'a', 'que', 'del', 'las', 'los', 'con', 'por', 'para'}
-        keywords = [w for w in words if len(w) > 3 and w not in stopwords]
-        return list(set(keywords))
+        return {w for w in words if len(w) >= _MIN_KEYWORD_LEN and w not in _STOPWORDS}
     
     def query_legal_evolution(self, query: str, context_type: Optional[str] = None) -> Dict:
         """
@@ -220,14 +435,46 @@ class LegalEvolutionMemoRAGLite:
         Returns:
             Dictionary with analysis results and sources
         """
+        return self._run_query(query, context_type)
+    
+    def _query_batch(self, queries: List[str], context_type: Optional[str] = None) -> List[Dict]:
+        """Run several queries sharing a single lookup of their keyword postings"""
+        query_keywords = [self._extract_keywords(query) for query in queries]
+        postings = {}
+        for keyword in set().union(*query_keywords):
+            keyword_postings = self._keyword_postings(keyword)
+            if keyword_postings is not None:
+                postings[keyword] = keyword_postings
+        
+        return [
+            self._run_query(query, context_type, keywords, postings)
+            for query, keywords in zip(queries, query_keywords)
+        ]
+    
+    def _run_query(self, query: str, context_type: Optional[str] = None,
+                   query_keywords: Optional[Set[str]] = None,
+                   postings: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+        """Answer a single query, optionally with precomputed keywords and postings"""
         try:
             print(f"🔍 Processing query: {query}")
             
+            # Serve repeated queries from the LRU cache
+            cache_key = (query, context_type)
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                # Deep copy so callers never share the cached lists and dicts
+                result = copy.deepcopy(cached)
+                result['timestamp'] = datetime.now().isoformat()
+                print(f"✅ Query served from cache - Confidence: {result['confidence']:.2f}")
+                return result
+            
             # Extract query keywords
-            query_keywords = self._extract_keywords(query)
+            if query_keywords is None:
+                query_keywords = self._extract_keywords(query)
             
             # Search memory index
-            relevant_cases = self._search_memory(query_keywords, context_type)
+            relevant_cases = self._search_memory(query_keywords, context_type, postings)
             
             # Generate response
             response = self._generate_response(query, relevant_cases)
@@ -245,6 +492,10 @@ class LegalEvolutionMemoRAGLite:
                 'timestamp': datetime.now().isoformat()
             }
             
+            self._query_cache[cache_key] = copy.deepcopy(result)
+            if len(self._query_cache) > self.config['query_cache_size']:
+                self._query_cache.popitem(last=False)
+            
             print(f"✅ Query processed - Confidence: {result['confidence']:.2f}")
             return result
             
@@ -255,86 +506,128 @@ class LegalEvolutionMemoRAGLite:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _search_memory(self, keywords: List[str], context_type: Optional[str] = None) -> List[Dict]:
-        """Search memory index for relevant cases"""
-        scored_cases = []
+    def _search_memory(self, keywords: Set[str], context_type: Optional[str] = None,
+                       postings: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
+        """
+        Search memory index for relevant cases
+        
+        A keyword matches a record when it occurs inside any indexed term of that
+        record (substring match, so 'inflacion' matches 'hiperinflacion'); the score
+        is the fraction of query keywords matched. Template labels of the memory
+        text are not indexed and never match.
         
-        # Search evolution cases
+        Args:
+            keywords: Lowercased query keywords
+            context_type: Optional filter for specific context
+            postings: Optional precomputed keyword -> record ordinals mapping
+        """
+        if not keywords:
+            return []
+        if postings is None:
+            postings = {}
+            for keyword in keywords:
+                keyword_postings = self._keyword_postings(keyword)
+                if keyword_postings is not None:
+                    postings[keyword] = keyword_postings
+        
+        collections = {}
         if not context_type or context_type == 'evolution_cases':
-            for case_id, case_data in self.memory_index['evolution_cases'].items():
-                score = self._calculate_relevance_score(case_data['content'], keywords)
-                if score > 0:
-                    scored_cases.append({
-                        'id': case_id,
-                        'type': 'evolution_case',
-                        'score': score,
-                        'content': case_data['content'],
-                        'metadata': case_data['metadata']
-                    })
-        
-        # Search crisis periods
+            collections['evolution_cases'] = 'evolution_case'
         if not context_type or context_type == 'crisis_periods':
-            for crisis_id, crisis_data in self.memory_index['crisis_periods'].items():
-                score = self._calculate_relevance_score(crisis_data['content'], keywords)
-                if score > 0:
-                    scored_cases.append({
-                        'id': crisis_id,
-                        'type': 'crisis_period',
-                        'score': score,
-                        'content': crisis_data['content'],
-                        'metadata': crisis_data['metadata']
-                    })
-        
-        # Sort by relevance and return top matches
-        scored_cases.sort(key=lambda x: x['score'], reverse=True)
-        return scored_cases[:self.config['retrieval_top_k']]
-    
-    def _calculate_relevance_score(self, content: str, keywords: List[str]) -> float:
-        """Calculate relevance score between content and keywords"""
-        if not keywords:
-            return 0.0
+            collections['crisis_periods'] = 'crisis_period'
         
-        content_lower = content.lower()
-        matches = sum(1 for keyword in keywords if keyword in content_lower)
-        return matches / len(keywords)
+        # Count keyword hits per record straight from the postings arrays
+        matched = [postings[keyword] for keyword in keywords if keyword in postings]
+        if not matched:
+            return []
+        ordinals, counts = np.unique(np.concatenate(matched), return_counts=True)
+        
+        in_scope = np.zeros(len(ordinals), dtype=bool)
+        for name in collections:
+            if name in self.memory_index['ordinal_ranges']:
+                start, stop = self.memory_index['ordinal_ranges'][name]
+                in_scope |= (ordinals >= start) & (ordinals < stop)
+        ordinals, counts = ordinals[in_scope], counts[in_scope]
+        
+        # Select the top-k without sorting every hit: keep the records scoring at
+        # least the k-th best count, then sort only those. The stable sort over
+        # ascending ordinals keeps index order among ties.
+        top_k = self.config['retrieval_top_k']
+        if top_k <= 0:
+            return []
+        candidates = np.arange(len(counts))
+        if len(counts) > top_k:
+            kth = len(counts) - top_k
+            candidates = np.flatnonzero(counts >= np.partition(counts, kth)[kth])
+        top = candidates[np.argsort(-counts[candidates], kind='stable')][:top_k]
+        
+        # Only the top matches are materialized; their memory text is left to
+        # _content_for(id, type) so queries never format content they do not use
+        scored_cases = []
+        for ordinal, count in zip(ordinals[top], counts[top]):
+            name, record_id = self.memory_index['records'][ordinal]
+            record_type = collections[name]
+            scored_cases.append({
+                'id': record_id,
+                'type': record_type,
+                'score': int(count) / len(keywords),
+                'metadata': self.memory_index[name][record_id]['metadata']
+            })
+        
+        return scored_cases
+    
+    def _keyword_postings(self, keyword: str) -> Optional[np.ndarray]:
+        """Ordinals of the records with an indexed term containing the keyword"""
+        # Keywords are already lowercased by _extract_keywords, like the indexed terms
+        index = self.memory_index['keywords']
+        matched = [ordinals for term, ordinals in index.items() if keyword in term]
+        if not matched:
+            return None
+        return np.unique(np.concatenate(matched))
     
     def _generate_response(self, query: str, relevant_cases: List[Dict]) -> str:
         """Generate response based on relevant cases"""
         if not relevant_cases:
             return "No se encontraron casos relevantes para la consulta."
         
-        response = f"Análisis de evolución legal para: '{query}'\n\n"
-        response += "Basado en el análisis del dataset Legal Evolution Dataset con Reality Filter:\n\n"
+        parts = [
+            f"Análisis de evolución legal para: '{query}'\n\n",
+            "Basado en el análisis del dataset Legal Evolution Dataset con Reality Filter:\n\n"
+        ]
         
         # Categorize cases by type
         evolution_cases = [c for c in relevant_cases if c['type'] == 'evolution_case']
         crisis_cases = [c for c in relevant_cases if c['type'] == 'crisis_period']
         
         if evolution_cases:
-            response += "📊 CASOS DE EVOLUCIÓN LEGAL RELEVANTES:\n"
+            parts.append("📊 CASOS DE EVOLUCIÓN LEGAL RELEVANTES:\n")
             for i, case in enumerate(evolution_cases[:5], 1):
                 metadata = case['metadata']
-                response += f"{i}. Área: {metadata['legal_area']}, "
-                response += f"Inicio: {metadata['start_date']}, "
-                response += f"Éxito: {metadata['success']} "
-                response += f"(Score: {case['score']:.2f})\n"
-            response += "\n"
+                parts.append(
+                    f"{i}. Área: {metadata['legal_area']}, "
+                    f"Inicio: {metadata['start_date']}, "
+                    f"Éxito: {metadata['success']} "
+                    f"(Score: {case['score']:.2f})\n"
+                )
+            parts.append("\n")
         
         if crisis_cases:
-            response += "⚡ PERÍODOS DE CRISIS RELEVANTES:\n"
+            parts.append("⚡ PERÍODOS DE CRISIS RELEVANTES:\n")
             for i, case in enumerate(crisis_cases[:3], 1):
                 metadata = case['metadata']
-                response += f"{i}. Tipo: {metadata['crisis_type']}, "
-                response += f"Severidad: {metadata['severity']}, "
-                response += f"Inicio: {metadata['start_date']} "
-                response += f"(Score: {case['score']:.2f})\n"
-            response += "\n"
+                parts.append(
+                    f"{i}. Tipo: {metadata['crisis_type']}, "
+                    f"Severidad: {metadata['severity']}, "
+                    f"Inicio: {metadata['start_date']} "
+                    f"(Score: {case['score']:.2f})\n"
+                )
+            parts.append("\n")
         
         # Add analysis insights
-        response += "🎯 INSIGHTS PRINCIPALES:\n"
-        response += self._generate_insights(relevant_cases)
+        parts.append("🎯 INSIGHTS PRINCIPALES:\n")
+        parts.append(self._generate_insights(relevant_cases))
         
-        return response
+        return ''.join(parts)
     
     def _generate_insights(self, cases: List[Dict]) -> str:
         """Generate insights from relevant cases"""
@@ -344,25 +637,23 @@ class LegalEvolutionMemoRAGLite:
             return "No se generaron insights suficientes.\n"
         
         # Legal area analysis
-        areas = [c['metadata'].get('legal_area') for c in cases if c['metadata'].get('legal_area')]
-        if areas:
-            most_common_area = max(set(areas), key=areas.count)
+        area_counts = Counter(c['metadata'].get('legal_area') for c in cases if c['metadata'].get('legal_area'))
+        if area_counts:
+            most_common_area = area_counts.most_common(1)[0][0]
             insights.append(f"- Área legal más relevante: {most_common_area}")
         
         # Success pattern analysis
-        successes = [c['metadata'].get('success') for c in cases if c['metadata'].get('success')]
-        if successes:
-            success_rate = successes.count('Exitoso') / len(successes) * 100
+        success_counts = Counter(c['metadata'].get('success') for c in cases if c['metadata'].get('success'))
+        if success_counts:
+            success_rate = success_counts['Exitoso'] / sum(success_counts.values()) * 100
             insights.append(f"- Tasa de éxito en casos relevantes: {success_rate:.1f}%")
         
         # Temporal pattern analysis
-        dates = [c['metadata'].get('start_date') for c in cases if c['metadata'].get('start_date')]
-        if dates:
-            years = [d[:4] for d in dates if d and len(d) >= 4]
-            if years:
-                earliest = min(years)
-                latest = max(years)
-                insights.append(f"- Período temporal: {earliest}-{latest}")
+        years = [d[:4] for d in (c['metadata'].get('start_date') for c in cases) if d and len(d) >= 4]
+        if years:
+            earliest = min(years)
+            latest = max(years)
+            insights.append(f"- Período temporal: {earliest}-{latest}")
         
         return "\n".join(insights) + "\n"
     
@@ -378,30 +669,22 @@ class LegalEvolutionMemoRAGLite:
         
         response_lower = response.lower()
         
-        # Detect legal areas
-        for area in self.config['legal_domains']:
-            if area in response_lower:
-                analysis['legal_areas_mentioned'].append(area)
-        
-        # Detect evolution mechanisms
-        mechanisms = ['acumulativa', 'artificial', 'mixta', 'transplante', 'endogeno', 'hibrido']
-        for mechanism in mechanisms:
-            if mechanism in response_lower:
-                analysis['evolution_mechanisms'].append(mechanism)
-        
-        # Detect success indicators
-        success_terms = ['exitoso', 'parcial', 'fracaso', 'en_desarrollo']
-        for term in success_terms:
-            if term in response_lower:
-                analysis['success_indicators'].append(term)
+        # Detect legal areas, evolution mechanisms and success indicators
+        if self._term_automaton is not None:
+            found = {term for _, term in self._term_automaton.iter(response_lower)}
+        else:
+            found = {term for term, _ in self._analysis_terms if term in response_lower}
+        for term, category in self._analysis_terms:
+            if term in found:
+                analysis[category].append(term)
         
         # Extract years
-        years = re.findall(r'\b(19|20)\d{2}\b', response)
+        years = _YEAR_RE.findall(response)
         analysis['temporal_patterns'] = list(set(years))
         
         return analysis
     
-    def _calculate_confidence(self, cases: List[Dict], keywords: List[str]) -> float:
+    def _calculate_confidence(self, cases: List[Dict], keywords: Set[str]) -> float:
         """Calculate confidence score"""
         if not cases:
             return 0.0
@@ -425,26 +708,12 @@ class LegalEvolutionMemoRAGLite:
     
     def _extract_sources(self, response: str) -> List[str]:
         """Extract legal sources from response"""
-        sources = []
-        
-        # Common Argentine legal source patterns
-        patterns = [
-            r'Ley \d+\.\d+',
-            r'Decreto \d+/\d+', 
-            r'Fallos \d+:\d+',
-            r'InfoLeg', r'SAIJ', r'CSJN', r'BCRA', r'CNV'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            sources.extend(matches)
-        
-        return list(set(sources))
+        return list({match.group(0) for match in _SOURCE_RE.finditer(response)})
     
     def analyze_evolution_velocity(self, legal_area: Optional[str] = None) -> Dict:
         """Analyze legal evolution velocity patterns"""
         try:
-            df = self.velocity_metrics.copy()
+            df = self.velocity_metrics
             if legal_area and not df.empty:
                 df = df[df['area_derecho'] == legal_area]
             
@@ -481,7 +750,7 @@ class LegalEvolutionMemoRAGLite:
     def track_legal_transplants(self, origin_country: Optional[str] = None) -> Dict:
         """Track legal transplant success patterns"""
         try:
-            df = self.transplants_tracking.copy()
+            df = self.transplants_tracking
             if origin_country and not df.empty:
                 df = df[df['origin_country'] == origin_country]
             
@@ -516,7 +785,7 @@ class LegalEvolutionMemoRAGLite:
     def crisis_impact_analysis(self, crisis_type: Optional[str] = None) -> Dict:
         """Analyze crisis impact on legal evolution"""
         try:
-            df = self.crisis_periods.copy()
+            df = self.crisis_periods
             if crisis_type and not df.empty:
                 df = df[df['crisis_type'].str.contains(crisis_type, na=False)]
             
@@ -579,8 +848,7 @@ class LegalEvolutionMemoRAGLite:
                 "¿Cuáles fueron los transplantes legales más exitosos?"
             ]
             
-            for query in sample_queries:
-                result = self.query_legal_evolution(query)
+            for query, result in zip(sample_queries, self._query_batch(sample_queries)):
                 report['sample_queries'].append({
                     'query': query,
                     'confidence': result.get('confidence', 0),
@@ -589,8 +857,8 @@ class LegalEvolutionMemoRAGLite:
                 })
             
             # Save report
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            with open(output_path, 'wb') as f:
+                f.write(_dumps_report(report))
             
             print(f"✅ Comprehensive report generated: {output_path}")
             return report